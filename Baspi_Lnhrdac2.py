@@ -18,11 +18,15 @@ from qcodes.station import Station
 from qcodes.instrument import VisaInstrument, InstrumentChannel, ChannelList, InstrumentModule
 from qcodes.parameters import ParameterWithSetpoints, create_on_off_val_mapping
 import qcodes.validators as validate
+from pyvisa.constants import ResourceAttribute
+from pyvisa.errors import VisaIOError
 
-from numpy import ndarray, array
+from numpy import ndarray, array, asarray, empty, arange, around, linspace, append, float64
 from functools import partial
+from typing import Callable, Iterator
 from dataclasses import dataclass
-from time import sleep
+from contextlib import contextmanager
+from time import sleep, monotonic
 
 # logging --------------------------------------------------------------
 
@@ -30,30 +34,51 @@ import logging
 
 log = logging.getLogger(__name__)
 
+# constants ------------------------------------------------------------
+
+# marks configuration values which have not been specified
+_UNSET = object()
+
+# DAC board each AWG is a part of
+_AWG_BOARD = {"a": "ab", "b": "ab", "c": "cd", "d": "cd"}
+
+# number of wave memory values in a memory block (blk? query), also used as size of the upload transfers
+_WAV_MEMORY_BLOCK_SIZE = 1000
+
+# value mappings shared by the parameters of all channels and AWGs
+_BANDWIDTH_MAPPING = create_on_off_val_mapping(on_val = "HBW", off_val = "LBW")
+_ON_OFF_MAPPING = create_on_off_val_mapping(on_val = "ON", off_val = "OFF")
+_START_STOP_MAPPING = create_on_off_val_mapping(on_val = "START", off_val = "STOP")
+
 # class ----------------------------------------------------------------
 
 class BaspiLnhrdac2LockingValidator(validate.Validator):
 
-    def __init__(self, submodule: any):
+    __slots__ = ("locked", "name")
+
+    def __init__(self, locked: Callable[[], bool], name: str):
         """
         This class implements a validator that can be used to lock any submodule of the main instrument.
-        The validator checks the locked-attribute inside the submodule. If True, the validator raises an error.
+        The validator only holds a getter of the locked-attribute of the submodule. If it returns True, the validator raises an error.
+        The locked-attribute is read without synchronisation, it is a single boolean flag which is only assigned as a whole.
 
         Parameters:
-        submodule: reference of submodule the locked-attribute is a part of
+        locked: getter of the locked-attribute of the submodule
+        name: name of the submodule, used in the error message
 
         Raises:
         ValueError: the submodule this parameter is a part of is locked
         """
-        self.submodule = submodule
+        self.locked = locked
+        self.name = name
 
     def validate(self, value: any, context = "BaspiLnhrdac2LockingValidator") -> None:
         """
         Validates if the locked-attribute is False. 
         """
 
-        if self.submodule.locked:
-            raise ValueError(f"Submodule {self.submodule} has been locked and is currently not accessible.")
+        if self.locked():
+            raise ValueError(f"Submodule {self.name} has been locked and is currently not accessible.")
         
 
 # class ----------------------------------------------------------------
@@ -82,6 +107,8 @@ class BaspiLnhrdac2Channel(InstrumentChannel):
 
         super().__init__(parent, name)
 
+        # the initial values are set for all channels at once by the instrument,
+        # only the parameter caches are initialized here
         self.voltage = self.add_parameter(
             name = "voltage",
             unit = "V",
@@ -90,23 +117,23 @@ class BaspiLnhrdac2Channel(InstrumentChannel):
             get_parser = BaspiLnhrdac2Controller.dacval_to_vval,
             set_parser = BaspiLnhrdac2Controller.vval_to_dacval,
             vals = validate.Numbers(min_value = -10.0, max_value = 10.0),
-            initial_value = 0.0
+            initial_cache_value = 0.0
         )
 
         self.high_bandwidth = self.add_parameter(
             name = "high_bandwidth",
             get_cmd = partial(controller.get_channel_bandwidth, channel),
             set_cmd = partial(controller.set_channel_bandwidth, channel),
-            val_mapping = create_on_off_val_mapping(on_val = "HBW", off_val = "LBW"),
-            initial_value = False
+            val_mapping = _BANDWIDTH_MAPPING,
+            initial_cache_value = False
         )
 
         self.enable = self.add_parameter(
             name = "enable",
             get_cmd = partial(controller.get_channel_status, channel),
             set_cmd = partial(controller.set_channel_status, channel),
-            val_mapping = create_on_off_val_mapping(on_val = "ON", off_val = "OFF"),
-            initial_value = False
+            val_mapping = _ON_OFF_MAPPING,
+            initial_cache_value = False
         )
 
 
@@ -145,11 +172,9 @@ class BaspiLnhrdac2AWG(InstrumentModule):
         self.__controller = controller
 
         self.locked = False
+        self.__locking_validator = BaspiLnhrdac2LockingValidator(partial(getattr, self, "locked"), self.full_name)
 
-        if awg.lower() == "a" or awg.lower() == "b":
-            board = "ab"
-        elif awg.lower() == "c" or awg.lower() == "d":
-            board = "cd"
+        board = _AWG_BOARD[awg.lower()]
 
         self.channel = self.add_parameter(
             name = "channel",
@@ -157,7 +182,7 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             set_cmd = partial(controller.set_awg_channel, awg),
             vals = validate.MultiTypeAnd(
                 validate.Ints(min_value = 1, max_value = 24), 
-                BaspiLnhrdac2LockingValidator(self)
+                self.__locking_validator
             )
         )
 
@@ -167,7 +192,7 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             set_cmd = partial(controller.set_awg_cycles, awg),
             vals = validate.MultiTypeAnd(
                 validate.Ints(min_value = 0, max_value = 4000000000),
-                BaspiLnhrdac2LockingValidator(self)
+                self.__locking_validator
             ),
             initial_value = 0
         )
@@ -181,7 +206,7 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             set_parser = self.__set_parser_awg_sampling_rate,
             vals = validate.MultiTypeAnd(
                 validate.Numbers(min_value = 0.00001, max_value = 4000.0),
-                BaspiLnhrdac2LockingValidator(self)
+                self.__locking_validator
             )
         )
 
@@ -194,7 +219,7 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             initial_value = 0,
             vals = validate.MultiTypeAnd(
                 validate.Ints(min_value = 0, max_value = 34000),
-                BaspiLnhrdac2LockingValidator(self)
+                self.__locking_validator
             )
         )
 
@@ -203,7 +228,6 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             label = "time",
             unit = "s",
             get_cmd = partial(self.__get_awg_time_axis, awg),
-            get_parser = partial(array, dtype = float),
             vals = validate.Arrays(shape = (self.length,))
         )
 
@@ -214,8 +238,7 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             parameter_class = ParameterWithSetpoints,
             get_cmd = partial(self.__get_awg_waveform, awg),
             set_cmd = partial(self.__set_awg_waveform, awg),
-            get_parser = partial(array, dtype = float),
-            set_parser = list,
+            set_parser = partial(asarray, dtype = float64),
             setpoints = (self.time_axis,),
             vals = validate.Arrays(shape = (self.length,), min_value = -10.0, max_value = 10.0)
         )
@@ -225,7 +248,7 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             get_cmd = partial(controller.get_awg_trigger_mode, awg),
             set_cmd = partial(controller.set_awg_trigger_mode, awg),
             val_mapping = {"disable": 0, "start only": 1, "start stop": 2, "single step": 3},
-            vals = BaspiLnhrdac2LockingValidator(self),
+            vals = self.__locking_validator,
             initial_value = "disable"
         )
 
@@ -234,12 +257,26 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             get_cmd = partial(controller.get_awg_run_state, awg),
             set_cmd = partial(controller.set_awg_start_stop, awg),
             get_parser = BaspiLnhrdac2AWG.__get_parser_awg_enable,
-            val_mapping = create_on_off_val_mapping(on_val = "START", off_val = "STOP"),
-            vals = BaspiLnhrdac2LockingValidator(self),
+            val_mapping = _START_STOP_MAPPING,
+            vals = self.__locking_validator,
             initial_value = False
         )
 
-        board = None
+    #-------------------------------------------------
+
+    @contextmanager
+    def unlocked(self) -> Iterator[None]:
+        """
+        Temporarily unlock the AWG. The previous locked-attribute is restored 
+        when leaving the with-block, also if an error occured inside of it.
+        """
+
+        locked = self.locked
+        self.locked = False
+        try:
+            yield
+        finally:
+            self.locked = locked
 
     #-------------------------------------------------
 
@@ -263,7 +300,7 @@ class BaspiLnhrdac2AWG(InstrumentModule):
     
     #-------------------------------------------------
 
-    def __get_awg_time_axis(self, awg: str) -> list[float]:
+    def __get_awg_time_axis(self, awg: str) -> ndarray:
         """
         Automatically creates the time axis for the saved waveform.
 
@@ -271,23 +308,20 @@ class BaspiLnhrdac2AWG(InstrumentModule):
         awg: selected AWG 
 
         returns:
-        list: list of time values for each voltage saved in the AWG waveform in s
+        ndarray: time values for each voltage saved in the AWG waveform in s
         """
 
-        board = {"a": "ab", "b": "ab", "c": "cd", "d": "cd"}
         memory_size = self.__controller.get_wav_memory_size(awg)
-        clock_period = self.__controller.get_awg_clock_period(board[awg])
-
-        increment = clock_period / 1000000
-        time_axis = []
-        for index in range(0, memory_size):
-            time_axis.append(round(index*increment,6))
+        clock_period = self.__controller.get_awg_clock_period(_AWG_BOARD[awg], cached = True)
 
-        return time_axis
+        # computed in place to avoid temporary arrays
+        time_axis = arange(memory_size, dtype = float64)
+        time_axis *= clock_period / 1000000
+        return around(time_axis, 6, out = time_axis)
 
     #-------------------------------------------------
         
-    def __get_awg_waveform(self, awg: str) -> list[float]:
+    def __get_awg_waveform(self, awg: str) -> ndarray:
         """
         Read the AWG waveform from device memory.
 
@@ -295,53 +329,53 @@ class BaspiLnhrdac2AWG(InstrumentModule):
         awg: selected AWG
 
         Returns:
-        list: AWG waveform values in V (Volt)
+        ndarray: AWG waveform values in V (Volt)
         """
 
-        memory = []
-        block_size = 1000 # number of points read by get_wav_memory_block()
         memory_size = self.__controller.get_wav_memory_size(awg)
-        adress_range_limit = memory_size // block_size
-        if memory_size % block_size != 0:
-            adress_range_limit += 1
-
-        # read memory blocks (1000 points) instead of single adresses for faster reading
-        for address in range(0, adress_range_limit):
-            data = self.__controller.get_wav_memory_block(awg, address * block_size)
-            last_value = data.pop()
-            while last_value == "NaN":
-                last_value = data.pop()
-            data.append(last_value)
-            memory.extend(data)
-
-        if len(memory) != memory_size:
+
+        # read memory blocks (1000 points) instead of single adresses for faster reading,
+        # all block queries are sent in one transfer to avoid a round trip per block
+        addresses = list(range(0, memory_size, _WAV_MEMORY_BLOCK_SIZE))
+        memory = empty(memory_size, dtype = float64)
+        memory_end = 0
+        for data in self.__controller.get_wav_memory_blocks(awg, addresses):
+            # strip the "NaN" padding of the last block
+            while data and data[-1] == "NaN":
+                data.pop()
+            if memory_end + len(data) > memory_size:
+                raise MemoryError("Error occured while reading the devices memory.")
+            memory[memory_end:memory_end + len(data)] = data
+            memory_end += len(data)
+
+        if memory_end != memory_size:
             raise MemoryError("Error occured while reading the devices memory.")   
         
         return memory
 
     #-------------------------------------------------
 
-    def __set_awg_waveform(self, awg: str, waveform: list[float]) -> None:
+    def __set_awg_waveform(self, awg: str, waveform: ndarray) -> None:
         """
         Write an AWG waveform into device memory. Memory is cleared before writing.
 
         Parameters:
         awg: selected AWG
-        waveform: list of voltages (+/- 10.000000 V)
+        waveform: array of voltages (+/- 10.000000 V)
         """
 
         # check for lock
-        validator = BaspiLnhrdac2LockingValidator(self)
-        validator.validate(waveform)
+        self.__locking_validator.validate(waveform)
 
         # check clock period
-        dac_board = {"a": "ab", "b": "ab", "c": "cd", "d": "cd"}
-        clock_period = self.__controller.get_awg_clock_period(dac_board[awg])
+        clock_period = self.__controller.get_awg_clock_period(_AWG_BOARD[awg], cached = True)
 
         self.__controller.clear_wav_memory(awg)
 
-        for address in range(0, len(waveform)):
-            self.__controller.set_wav_memory_value(awg, address, float(waveform[address]))
+        # write memory blocks (1000 points) in a single transfer each instead of single adresses for faster writing
+        for address in range(0, len(waveform), _WAV_MEMORY_BLOCK_SIZE):
+            block = waveform[address:address + _WAV_MEMORY_BLOCK_SIZE]
+            self.__controller.set_wav_memory_values(awg, address, block)
 
         sleep(0.2) # sleep bc bad firmware
         memory_size = self.__controller.get_wav_memory_size(awg)
@@ -350,12 +384,12 @@ class BaspiLnhrdac2AWG(InstrumentModule):
             raise MemoryError("Error occured while writing to the devices memory.")
         
         self.__controller.write_wav_to_awg(awg)
-        while self.__controller.get_wav_memory_busy(awg):
-            pass
+        self.__controller.wait_wav_memory_ready(awg)
 
-        # reset clock period bc gets changed by a ghost while write_wav_to_awg()
-        if self.__controller.get_awg_clock_period(dac_board[awg]) != clock_period:
-            self.__controller.set_awg_clock_period(dac_board[awg], clock_period)
+        # reset clock period bc gets changed by a ghost while write_wav_to_awg(),
+        # write_wav_to_awg() clears the cached clock period so it is read from the device here
+        if self.__controller.get_awg_clock_period(_AWG_BOARD[awg]) != clock_period:
+            self.__controller.set_awg_clock_period(_AWG_BOARD[awg], clock_period)
     
     #-------------------------------------------------
 
@@ -370,6 +404,39 @@ class BaspiLnhrdac2AWG(InstrumentModule):
         else: return "STOP"
     
 
+# class ----------------------------------------------------------------
+
+class BaspiLnhrdac2ConfigValue():
+    """
+    Descriptor for the values of the configuration dataclasses.
+    Accessed on the class it returns _UNSET, which the dataclass uses as default value of the field.
+    Set values are checked against the _RANGES of the dataclass, _UNSET is not checked.
+
+    Raises:
+    ValueError: value is of the wrong type or out of range
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.private_name = "_" + name
+
+    def __get__(self, instance: any, owner: type = None) -> any:
+        if instance is None:
+            return _UNSET
+        return getattr(instance, self.private_name)
+
+    def __set__(self, instance: any, val: int | float) -> None:
+        if val is not _UNSET:
+            if not isinstance(val, (int, float)):
+                raise ValueError(f"Configuration value {self.name} is of not the correct type.")
+            min, max = instance._RANGES[self.name]
+            if val < min: 
+                raise ValueError(f"Configuration value {self.name} is too small. Increase {self.name} to {min}.")
+            if val > max: 
+                raise ValueError(f"Configuration value {self.name} is too big. Decrease {self.name} to {max}.")
+        setattr(instance, self.private_name, val)
+
+
 # class ----------------------------------------------------------------
 
 @dataclass
@@ -387,86 +454,34 @@ class BaspiLnhrdac2SWGConfig():
     """
 
     shape: str
-    frequency: float
-    amplitude: float
-    offset: float
-    phase: float
-    dutycycle: float
+    frequency: float = BaspiLnhrdac2ConfigValue()
+    amplitude: float = BaspiLnhrdac2ConfigValue()
+    offset: float = BaspiLnhrdac2ConfigValue()
+    phase: float = BaspiLnhrdac2ConfigValue()
+    dutycycle: float = BaspiLnhrdac2ConfigValue()
+
+    # default values for unspecified values
+    _DEFAULTS = {"frequency": 100.0,
+                 "amplitude": 1.0,
+                 "offset": 0.0,
+                 "phase": 0.0,
+                 "dutycycle": 0.0}
+
+    # valid ranges (min, max) of the properties
+    _RANGES = {"frequency": (0.001, 10_000.0),
+               "amplitude": (-50.0, 50.0),
+               "offset": (-10.0, 10.0),
+               "phase": (-360.0, 360.0),
+               "dutycycle": (0.0, 100.0)}
 
     #-------------------------------------------------
 
     def __post_init__(self):
         """default values for unspecified values"""
-        if isinstance(self.shape, property):
-            self.shape = "sine"
-        if isinstance(self.frequency, property):
-            self.frequency = 100.0
-        if isinstance(self.amplitude, property):
-            self.amplitude = 1.0
-        if isinstance(self.offset, property):
-            self.offset = 0.0
-        if isinstance(self.phase, property):
-            self.phase = 0.0
-        if isinstance(self.dutycycle, property):
-            self.dutycycle = 0.0
-
-    #-------------------------------------------------
+        for prop, default in self._DEFAULTS.items():
+            if getattr(self, prop) is _UNSET:
+                setattr(self, prop, default)
 
-    def __check_min_max(self, val: int | float, min: int | float, max: int | float, prop: str) -> None:
-        """check validity of properties"""
-        if isinstance(val, property):
-            # do nothing if value is not specified
-            return
-        
-        if not isinstance(val, (int, float)):
-            raise ValueError(f"Configuration value {prop} is of not the correct type.")
-        if val < min: 
-            raise ValueError(f"Configuration value {prop} is too small. Increase {prop} to {min}.")
-        if val > max: 
-            raise ValueError(f"Configuration value {prop} is too big. Decrease {prop} to {max}.")
-        
-    #-------------------------------------------------
-
-    @property
-    def frequency(self) -> float:
-        return self._frequency
-    @frequency.setter
-    def frequency(self, val: float) -> None:
-        self.__check_min_max(val, min = 0.001, max = 10_000.0, prop = "frequency")
-        self._frequency = val
-
-    @property
-    def amplitude(self) -> float:
-        return self._amplitude
-    @amplitude.setter
-    def amplitude(self, val: float) -> None:
-        self.__check_min_max(val, min = -50.0, max = 50.0, prop = "amplitude")
-        self._amplitude = val
-
-    @property
-    def offset(self) -> float:
-        return self._offset
-    @offset.setter
-    def offset(self, val: float) -> None:
-        self.__check_min_max(val, min = -10.0, max = 10.0, prop = "offset")
-        self._offset = val
-    
-    @property
-    def phase(self) -> float:
-        return self._phase
-    @phase.setter
-    def phase(self, val: float) -> None:
-        self.__check_min_max(val, min = -360.0, max = 360.0, prop = "phase")
-        self._phase = val
-
-    @property
-    def dutycycle(self) -> float:
-        return self._dutycycle
-    @dutycycle.setter
-    def dutycycle(self, val: float) -> None:
-        self.__check_min_max(val, min = 0.0, max = 100.0, prop = "dutycycle")
-        self._dutycycle = val
-            
 
 # class ----------------------------------------------------------------
 
@@ -490,6 +505,10 @@ class BaspiLnhrdac2SWG(InstrumentModule):
         super().__init__(parent, name)
         self.__controller = controller
 
+        # AWG submodules the SWG can apply its waveform to, the AWGs have to be added to the parent beforehand
+        self.__awgs = {awg: parent.submodules[f"awg{awg}"] for awg in ("a", "b", "c", "d")
+                       if f"awg{awg}" in parent.submodules}
+
         self.configuration = self.add_parameter(
             name = "configuration",
             get_cmd = None,
@@ -515,10 +534,7 @@ class BaspiLnhrdac2SWG(InstrumentModule):
         config: object containing SWG configuration
         """
         
-        self.__controller.set_swg_new(True)
-
-        # always use "adapt clock" here, clock gets checked again in swg.apply
-        self.__controller.set_swg_adapt_clock(True)
+        controller = self.__controller
 
         awg_shapes = {"sine": 0,
                       "cosine": 0,
@@ -533,21 +549,26 @@ class BaspiLnhrdac2SWG(InstrumentModule):
 
         if config.shape not in awg_shapes:
             raise ValueError(f"Value '{config.shape}' is invalid. Valid values are: {list(awg_shapes.keys())}.")
-        
+
+        controller.set_swg_new(True)
+
+        # always use "adapt clock" here, clock gets checked again in swg.apply
+        controller.set_swg_adapt_clock(True)
+
         # specify waveform
-        self.__controller.set_swg_shape(awg_shapes[config.shape])
-        self.__controller.set_swg_desired_frequency(config.frequency)
-        self.__controller.set_swg_amplitude(config.amplitude)
-        self.__controller.set_swg_offset(config.offset)
+        controller.set_swg_shape(awg_shapes[config.shape])
+        controller.set_swg_desired_frequency(config.frequency)
+        controller.set_swg_amplitude(config.amplitude)
+        controller.set_swg_offset(config.offset)
 
         if config.shape == "cosine":
-            self.__controller.set_swg_phase(config.phase + 90.0)
+            controller.set_swg_phase(config.phase + 90.0)
         else:
-            self.__controller.set_swg_phase(config.phase)
+            controller.set_swg_phase(config.phase)
         if config.shape == "rectangle":
-            self.__controller.set_swg_dutycycle(50.0)
+            controller.set_swg_dutycycle(50.0)
         elif config.shape == "pulse":
-            self.__controller.set_swg_dutycycle(config.dutycycle)
+            controller.set_swg_dutycycle(config.dutycycle)
 
     #-------------------------------------------------
 
@@ -563,20 +584,13 @@ class BaspiLnhrdac2SWG(InstrumentModule):
 
         # set awgX.length parameter, also checks if AWG is locked
         wav_memory_size = self.__controller.get_wav_memory_size(awg)
-        if awg == "a":
-            self.parent.awga.length.set(wav_memory_size)
-        elif awg == "b":
-            self.parent.awgb.length.set(wav_memory_size)
-        elif awg == "c":
-            self.parent.awgc.length.set(wav_memory_size)
-        elif awg == "d":
-            self.parent.awgd.length.set(wav_memory_size)
-
-        self.__controller.set_swg_wav_memory(awg)
+        self.__awgs[awg].length.set(wav_memory_size)
 
         # decide on keep or adapt clock period
         other_awg = {"a": "b", "b": "a", "c": "d", "d": "c"}
         other_awg_size = self.__controller.get_awg_memory_size(other_awg[awg])
+
+        self.__controller.set_swg_wav_memory(awg)
         if other_awg_size > 2:
             self.__controller.set_swg_adapt_clock(False)
         else:
@@ -587,24 +601,16 @@ class BaspiLnhrdac2SWG(InstrumentModule):
         if nearest_frequency != desired_frequency:
             print(f"Frequency of {desired_frequency} Hz cannot be reached with the current settings. "
                 + f"A frequency of {nearest_frequency} Hz is used instead. "
-                + f"Changing AWG or clearing unused AWG waveforms might resolve this issue.")
+                + "Changing AWG or clearing unused AWG waveforms might resolve this issue.")
 
         # apply SWG configuration to AWG waveform
         self.__controller.apply_swg_operation()
         self.__controller.write_wav_to_awg(awg)
-        while self.__controller.get_wav_memory_busy(awg):
-            pass
+        self.__controller.wait_wav_memory_ready(awg)
 
         awg_memory_size = self.__controller.get_awg_memory_size(awg)
         if awg_memory_size != wav_memory_size:
-            if awg == "a":
-                self.parent.awga.length.set(awg_memory_size)
-            elif awg == "b":
-                self.parent.awgb.length.set(awg_memory_size)
-            elif awg == "c":
-                self.parent.awgc.length.set(awg_memory_size)
-            elif awg == "d":
-                self.parent.awgd.length.set(awg_memory_size)
+            self.__awgs[awg].length.set(awg_memory_size)
 
 
 # class ----------------------------------------------------------------
@@ -627,140 +633,50 @@ class BaspiLnhrdac2Fast2dConfig():
     adaptive_shift: voltage shift in V which is applied to the x-axis, after every y-axis sweep (+/- 10.000000 V)
     """
     
-    x_channel: int
-    x_start_voltage: float
-    x_stop_voltage: float
-    x_steps: int
-    y_channel: int
-    y_start_voltage: float
-    y_stop_voltage: float
-    y_steps: int
-    acquisition_delay: float
-    adaptive_shift: float
+    x_channel: int = BaspiLnhrdac2ConfigValue()
+    x_start_voltage: float = BaspiLnhrdac2ConfigValue()
+    x_stop_voltage: float = BaspiLnhrdac2ConfigValue()
+    x_steps: int = BaspiLnhrdac2ConfigValue()
+    y_channel: int = BaspiLnhrdac2ConfigValue()
+    y_start_voltage: float = BaspiLnhrdac2ConfigValue()
+    y_stop_voltage: float = BaspiLnhrdac2ConfigValue()
+    y_steps: int = BaspiLnhrdac2ConfigValue()
+    acquisition_delay: float = BaspiLnhrdac2ConfigValue()
+    adaptive_shift: float = BaspiLnhrdac2ConfigValue()
+
+    # default values for unspecified values
+    _DEFAULTS = {"x_channel": 1,
+                 "x_start_voltage": 0.0,
+                 "x_stop_voltage": 1.0,
+                 "x_steps": 10,
+                 "y_channel": 2,
+                 "y_start_voltage": 0.0,
+                 "y_stop_voltage": 1.0,
+                 "y_steps": 10,
+                 "acquisition_delay": 0.0,
+                 "adaptive_shift": 0.0}
+
+    # valid ranges (min, max) of the properties
+    _RANGES = {"x_channel": (1, 12),
+               "x_start_voltage": (-10.0, 10.0),
+               "x_stop_voltage": (-10.0, 10.0),
+               "x_steps": (10, 16_777_216),
+               "y_channel": (1, 12),
+               "y_start_voltage": (-10.0, 10.0),
+               "y_stop_voltage": (-10.0, 10.0),
+               "y_steps": (1, 16_777_216),
+               "acquisition_delay": (0.00001, 4000.0),
+               "adaptive_shift": (-10.0, 10.0)}
 
     #-------------------------------------------------
 
     def __post_init__(self):
         """default values for unspecified values"""
-        if isinstance(self.x_channel, property):
-            self.x_channel = 1
-        if isinstance(self.x_start_voltage, property):
-            self.x_start_voltage = 0.0
-        if isinstance(self.x_stop_voltage, property):
-            self.x_stop_voltage = 1.0
-        if isinstance(self.x_steps, property):
-            self.x_steps = 10
-        if isinstance(self.y_channel, property):
-            self.y_channel = 2
-        if isinstance(self.y_start_voltage, property):
-            self.y_start_voltage = 0.0
-        if isinstance(self.y_stop_voltage, property):
-            self.y_stop_voltage = 1.0
-        if isinstance(self.y_steps, property):
-            self.y_steps = 10
-        if isinstance(self.acquisition_delay, property):
-            self.acquisition_delay = 0.0
-        if isinstance(self.adaptive_shift, property):
-            self.adaptive_shift = 0.0
-    
-    #-------------------------------------------------
+        for prop, default in self._DEFAULTS.items():
+            if getattr(self, prop) is _UNSET:
+                setattr(self, prop, default)
 
-    def __check_min_max(self, val: int | float, min: int | float, max: int | float, prop: str) -> None:
-        """check validity of properties"""
-        if isinstance(val, property):
-            # default values are not checked!
-            return
-        
-        if not isinstance(val, (int, float)):
-            raise ValueError(f"Configuration value {prop} is of not the correct type.")
-        if val < min: 
-            raise ValueError(f"Configuration value {prop} is too small. Increase {prop} to {min}.")
-        if val > max: 
-            raise ValueError(f"Configuration value {prop} is too big. Decrease {prop} to {max}.")
-        
-    #-------------------------------------------------
 
-    @property
-    def x_channel(self) -> int:
-        return self._x_channel
-    @x_channel.setter
-    def x_channel(self, val: int) -> None:
-        self.__check_min_max(val, min = 1, max = 12, prop = "x_channel")
-        self._x_channel = val
-
-    @property
-    def x_start_voltage(self) -> float:
-        return self._x_start_voltage
-    @x_start_voltage.setter
-    def x_start_voltage(self, val: float) -> None:
-        self.__check_min_max(val, min = -10.0, max = 10.0, prop = "x_start_voltage")
-        self._x_start_voltage = val
-
-    @property
-    def x_stop_voltage(self) -> float:
-        return self._x_stop_voltage
-    @x_stop_voltage.setter
-    def x_stop_voltage(self, val: float) -> None:
-        self.__check_min_max(val, min = -10.0, max = 10.0, prop = "x_stop_voltage")
-        self._x_stop_voltage = val
-
-    @property
-    def x_steps(self) -> int:
-        return self._x_steps
-    @x_steps.setter
-    def x_steps(self, val: int) -> None:
-        self.__check_min_max(val, min = 10, max = 16_777_216, prop = "x_steps")
-        self._x_steps = val
-
-    @property
-    def y_channel(self) -> int:
-        return self._y_channel
-    @y_channel.setter
-    def y_channel(self, val: int) -> None:
-        self.__check_min_max(val, min = 1, max = 12, prop = "y_channel")
-        self._y_channel = val
-
-    @property
-    def y_start_voltage(self) -> float:
-        return self._y_start_voltage
-    @y_start_voltage.setter
-    def y_start_voltage(self, val: float) -> None:
-        self.__check_min_max(val, min = -10.0, max = 10.0, prop = "y_start_voltage")
-        self._y_start_voltage = val
-
-    @property
-    def y_stop_voltage(self) -> float:
-        return self._y_stop_voltage
-    @y_stop_voltage.setter
-    def y_stop_voltage(self, val: float) -> None:
-        self.__check_min_max(val, min = -10.0, max = 10.0, prop = "y_stop_voltage")
-        self._y_stop_voltage = val
-
-    @property
-    def y_steps(self) -> int:
-        return self._y_steps
-    @y_steps.setter
-    def y_steps(self, val: int) -> None:
-        self.__check_min_max(val, min = 1, max = 16_777_216, prop = "y_steps")
-        self._y_steps = val
-
-    @property
-    def acquisition_delay(self) -> float:
-        return self._acquisition_delay
-    @acquisition_delay.setter
-    def acquisition_delay(self, val: float) -> None:
-        self.__check_min_max(val, min = 0.00001, max = 4000.0, prop = "acquisition_delay")
-        self._acquisition_delay = val
-
-    @property
-    def adaptive_shift(self) -> float:
-        return self._adaptive_shift
-    @adaptive_shift.setter
-    def adaptive_shift(self, val: float) -> None:
-        self.__check_min_max(val, min = -10.0, max = 10.0, prop = "adaptive_shift")
-        self._adaptive_shift = val
-
-      
 # class ----------------------------------------------------------------
 
 class BaspiLnhrdac2Fast2d(InstrumentModule):
@@ -793,6 +709,12 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         self.__awg_xy = None
         self.__current_config = None
 
+        # setup methods of the trigger modes
+        self.__trigger_modes = {"disable": self.__set_2d_trigger_disable,
+                                "line in": self.__set_2d_trigger_line_in,
+                                "line out": self.__set_2d_trigger_line_out,
+                                "point out": self.__set_2d_trigger_point_out}
+
         self.configuration = self.add_parameter(
             name = "configuration",
             get_cmd = None,
@@ -809,7 +731,8 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         self.trigger = self.add_parameter(
             name = "trigger",
             get_cmd = None,
-            set_cmd = self.__set_2d_trigger
+            set_cmd = self.__set_2d_trigger,
+            vals = validate.Enum("disable", "line in", "line out", "point out")
         )
 
         self.x_axis = self.add_parameter(
@@ -856,70 +779,67 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         config: object containing 2D scan configuration
         """
 
-        print("Starting to configure fast adaptive 2D scan. AWG A will be repurposed. AWG A and AWG B connot be used while the 2D scan is running.")
+        controller = self.__controller
+        awga = self.parent.awga
+        awgb = self.parent.awgb
+
+        log.info("Starting to configure fast adaptive 2D scan. AWG A will be repurposed. AWG A and AWG B connot be used while the 2D scan is running.")
 
         # check if AWG can be used
-        if not self.__controller.get_awg_run_state("a") \
-        and self.__controller.get_ramp_state("a") == 0 \
-        and not self.__controller.get_awg_run_state("b") \
-        and self.__controller.get_ramp_state("b") == 0:
+        awg_states, ramp_states = controller.get_awg_and_ramp_states(["a", "b"])
+        if not any(awg_states) and all(state == 0 for state in ramp_states):
             self.__awg_xy = "a"
         else:
-            raise SystemError(f"During the setup of the fast adaptive 2D scan, AWG A and B must not run.")
+            raise SystemError("During the setup of the fast adaptive 2D scan, AWG A and B must not run.")
         
         if self.__awg_xy == "a":
-            self.parent.awga.locked = False
+            awga.locked = False
 
         # self.__controller.set_awg_channel(self.__awg_xy, config.y_channel)
-        self.parent.awga.channel.set(config.y_channel)
-        if not self.__controller.get_awg_channel_availability(self.__awg_xy):
+        awga.channel.set(config.y_channel)
+        if not controller.get_awg_channel_availability(self.__awg_xy):
             raise SystemError(f"The chosen y-axis output (channel {config.y_channel}) is not available.")
-        
-        self.__controller.set_ramp_channel(self.__awg_xy, config.x_channel)
-        if not self.__controller.get_ramp_channel_availability(self.__awg_xy):
-            raise SystemError(f"The chosen x-axis output (channel {config.y_channel}) is not available.")
+
+        controller.set_ramp_channel(self.__awg_xy, config.x_channel)
+        if not controller.get_ramp_channel_availability(self.__awg_xy):
+            raise SystemError(f"The chosen x-axis output (channel {config.x_channel}) is not available.")
 
         # calculate internal values, check for limits
         x_ramp_time = 0.005 * (config.x_steps + 1)
-        y_step_size = (config.y_stop_voltage - config.y_start_voltage) / config.y_steps
         y_period = config.y_steps * config.acquisition_delay
         if y_period < 0.006:
             raise SystemError(f"The configured y-axis sweep is too short ({y_period:.3f} s). Minimal sweep time is 0.006 s. Increase number of steps or acquisition delay.")
 
         # set up x-axis
-        self.__controller.set_ramp_starting_voltage(self.__awg_xy, config.x_start_voltage)
-        self.__controller.set_ramp_peak_voltage(self.__awg_xy, config.x_stop_voltage)
-        self.__controller.set_ramp_duration(self.__awg_xy, x_ramp_time)
-        self.__controller.set_ramp_shape(self.__awg_xy, 0)
-        self.__controller.set_ramp_cycles(self.__awg_xy, 1)
-        self.__controller.select_ramp_step(self.__awg_xy, 1)
-
-        # set up y-axis
-        y_axis_waveform = []
-        for step in range(0, config.y_steps + 1):
-            y_axis_waveform.append((step * y_step_size) + config.y_start_voltage)
-        y_axis_waveform.append(config.y_start_voltage)
-        y_axis_waveform = array(y_axis_waveform)
-
-        self.parent.awga.trigger.set("disable")
-        self.parent.awga.cycles.set(1)
-        self.parent.awga.sampling_rate.set(config.acquisition_delay)
-        self.parent.awga.length.set(len(y_axis_waveform))
-        self.parent.awga.waveform.set(y_axis_waveform)
+        controller.set_ramp_starting_voltage(self.__awg_xy, config.x_start_voltage)
+        controller.set_ramp_peak_voltage(self.__awg_xy, config.x_stop_voltage)
+        controller.set_ramp_duration(self.__awg_xy, x_ramp_time)
+        controller.set_ramp_shape(self.__awg_xy, 0)
+        controller.set_ramp_cycles(self.__awg_xy, 1)
+        controller.select_ramp_step(self.__awg_xy, 1)
+
+        # set up y-axis, last point returns to the starting voltage
+        y_axis_waveform = linspace(config.y_start_voltage, config.y_stop_voltage, config.y_steps + 1, dtype = float64)
+        y_axis_waveform = append(y_axis_waveform, config.y_start_voltage)
+
+        awga.trigger.set("disable")
+        awga.cycles.set(1)
+        awga.sampling_rate.set(config.acquisition_delay)
+        awga.length.set(len(y_axis_waveform))
+        awga.waveform.set(y_axis_waveform)
 
         # set up adaptive shift
-        adaptive_scan = 1 if config.adaptive_shift != 0.0 else 0
-        self.__controller.set_awg_start_mode(self.__awg_xy, 1)
-        self.__controller.set_awg_reload_mode(self.__awg_xy, adaptive_scan)
-        self.__controller.set_apply_polynomial(self.__awg_xy, adaptive_scan)
+        controller.set_2d_scan_mode(self.__awg_xy, config.adaptive_shift)
 
-        # lock AWG to prevent User from manipulating/ breaking stuff
-        self.parent.awga.locked = True
-        self.parent.awgb.locked = True
+        # lock AWG to prevent User from manipulating/ breaking stuff,
+        # AWG B is locked as well: it shares the board (clock period, sync) with AWG A and must stay idle.
+        # locked is a plain attribute, setting it does not communicate with the device
+        awga.locked = True
+        awgb.locked = True
 
         self.__current_config = config
 
-        print("Fast adaptive 2D scan sucessfully configured. Ready to start.")
+        log.info("Fast adaptive 2D scan sucessfully configured. Ready to start.")
 
     #-------------------------------------------------
 
@@ -932,12 +852,10 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         int: "point out" trigger output (13 ... 24)
         """
 
-        if self.__awg_trig == "c":
-            self.parent.awgc.locked = False
-            channel = self.parent.awgc.channel.get()
-            self.parent.awgc.locked = True
-        else:
-            channel = self.parent.awgc.channel.get()
+        awgc = self.parent.awgc
+
+        with awgc.unlocked():
+            channel = awgc.channel.get()
 
         return channel
 
@@ -952,12 +870,10 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         channel: select "point out" trigger output (13 ... 24)
         """
 
-        if self.__awg_trig == "c":
-            self.parent.awgc.locked = False
-            self.parent.awgc.channel.set(channel)
-            self.parent.awgc.locked = True
-        else:
-            self.parent.awgc.channel.set(channel)
+        awgc = self.parent.awgc
+
+        with awgc.unlocked():
+            awgc.channel.set(channel)
 
     #-------------------------------------------------
 
@@ -971,77 +887,94 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
        
         """
 
-        print("Starting to configure fast 2D scan trigger. AWG C might be repurposed. AWG C and AWG D connot be used while the point to point trigger output is running.")
-        
-        fast2d_triggers = (
-            "disable",
-            "line in",
-            "line out",
-            "point out"
-        )
-
-        if mode not in fast2d_triggers:
-            raise ValueError(f"Value '{mode}' is invalid. Valid values are: {fast2d_triggers}.")
+        log.info("Starting to configure fast 2D scan trigger. AWG C might be repurposed. AWG C and AWG D connot be used while the point to point trigger output is running.")
 
-        if self.__current_config == None:
-            raise SystemError(f"No fast 2D scan configuration available. Set configuration parameter first.")
+        if self.__current_config is None:
+            raise SystemError("No fast 2D scan configuration available. Set configuration parameter first.")
         
-        if self.__controller.get_awg_run_state("a") \
-        or self.__controller.get_ramp_state("a") == 1 \
-        or self.__controller.get_awg_run_state("b") \
-        or self.__controller.get_ramp_state("b") == 1:
-            raise SystemError(f"During the setup of the fast adaptive 2D scan trigger, all AWGs must not run.")
+        awg_states, ramp_states = self.__controller.get_awg_and_ramp_states(["a", "b"])
+        if any(awg_states) or any(state == 1 for state in ramp_states):
+            raise SystemError("During the setup of the fast adaptive 2D scan trigger, all AWGs must not run.")
 
-        self.parent.awga.locked = False
+        # AWG A is locked again when leaving the with-block, AWG C and D are only locked for "point out"
         self.parent.awgc.locked = False
         self.parent.awgd.locked = False
-        if mode == "disable":
-            self.__awg_trig = None
-            self.parent.awga.trigger.set("disable")
-            self.__controller.set_awg_start_mode(self.__awg_xy, 1)
-            print(f"Fast 2D scan trigger now set to '{mode}'.")
-            if self.__awg_xy == "a":
-                self.parent.awga.locked = True
-        elif mode == "line in":
-            self.__awg_trig = None
-            self.parent.awga.trigger.set("start only")
-            self.__controller.set_awg_start_mode(self.__awg_xy, 0)
-            print(f"Trigger mode '{mode}' cannot access channel {self.parent.fast2d.trigger_channel.get()}. Use 'Trig In AWG A' instead.")
-            self.parent.awga.locked = True
-        elif mode == "line out":
-            self.__awg_trig = None
-            self.parent.awga.trigger.set("disable")
-            self.__controller.set_awg_start_mode(self.__awg_xy, 1)
-            print(f"Trigger mode '{mode}' cannot access channel {self.parent.fast2d.trigger_channel.get()}. Use 'Sync Out AWG A' instead.")
-            if self.__awg_xy == "a":
-                self.parent.awga.locked = True
-        elif mode == "point out":
-            # choosing AWG for trigger
-            if not self.__controller.get_awg_run_state("c") \
-            and not self.__controller.get_awg_run_state("d"):
-                self.__awg_trig = "c"
-            else:
-                raise SystemError(f"During the setup of the fast 2D scan point by point trigger output, AWG C and D must not run.")
-
-            # trigger signal must have 1/2 of sweeping frequency
-            trig_config = BaspiLnhrdac2SWGConfig(
-                shape = "rectangle",
-                frequency = float(1.0 / self.__current_config.acquisition_delay),
-                amplitude = 2.5,
-                offset = 2.5
-            )
-                       
-            self.parent.swg.configuration.set(trig_config)
-            self.parent.swg.apply("C")
-            self.parent.awgc.cycles.set(self.__current_config.y_steps)
-            self.parent.awgc.trigger.set("start only")
-            if self.__awg_xy == "a":
-                self.parent.awga.locked = True
-            self.parent.awgc.locked = True
-            self.parent.awgd.locked = True
+        with self.parent.awga.unlocked():
+            self.__trigger_modes[mode]()
+
+    #-------------------------------------------------
+
+    def __set_2d_trigger_disable(self) -> None:
+        """
+        Set up trigger mode "disable": no trigger/ scan as fast as possible.
+        """
 
-            print(f"Trigger mode '{mode}' requires a physical connection inbetween the devices 'Sync Out AWG A' and 'Trig In AWG C' outputs.")
-            print(f"Fast 2D scan trigger now set to '{mode}', using DAC channel {self.parent.fast2d.trigger_channel.get()}.")
+        self.__awg_trig = None
+        self.parent.awga.trigger.set("disable")
+        self.__controller.set_awg_start_mode(self.__awg_xy, 1)
+        log.info("Fast 2D scan trigger now set to 'disable'.")
+
+    #-------------------------------------------------
+
+    def __set_2d_trigger_line_in(self) -> None:
+        """
+        Set up trigger mode "line in": external trigger starts every x-axis sweep.
+        """
+
+        self.__awg_trig = None
+        self.parent.awga.trigger.set("start only")
+        self.__controller.set_awg_start_mode(self.__awg_xy, 0)
+        log.warning("Trigger mode 'line in' cannot access channel %s. Use 'Trig In AWG A' instead.", self.trigger_channel.cache.get())
+
+    #-------------------------------------------------
+
+    def __set_2d_trigger_line_out(self) -> None:
+        """
+        Set up trigger mode "line out": trigger is set with every x-axis sweep.
+        """
+
+        self.__awg_trig = None
+        self.parent.awga.trigger.set("disable")
+        self.__controller.set_awg_start_mode(self.__awg_xy, 1)
+        log.warning("Trigger mode 'line out' cannot access channel %s. Use 'Sync Out AWG A' instead.", self.trigger_channel.cache.get())
+
+    #-------------------------------------------------
+
+    def __set_2d_trigger_point_out(self) -> None:
+        """
+        Set up trigger mode "point out": trigger is set with every x-axis step. 
+        AWG C outputs the trigger signal, AWG C and D get locked.
+        """
+
+        controller = self.__controller
+        awgc = self.parent.awgc
+        awgd = self.parent.awgd
+
+        # choosing AWG for trigger
+        if not any(controller.get_awgs_run_states(["c", "d"])):
+            self.__awg_trig = "c"
+        else:
+            raise SystemError("During the setup of the fast 2D scan point by point trigger output, AWG C and D must not run.")
+
+        # trigger signal must have 1/2 of sweeping frequency
+        trig_config = BaspiLnhrdac2SWGConfig(
+            shape = "rectangle",
+            frequency = float(1.0 / self.__current_config.acquisition_delay),
+            amplitude = 2.5,
+            offset = 2.5
+        )
+                   
+        self.parent.swg.configuration.set(trig_config)
+        self.parent.swg.apply("C")
+        awgc.cycles.set(self.__current_config.y_steps)
+        awgc.trigger.set("start only")
+        awgc.locked = True
+        awgd.locked = True
+
+        log.warning("Trigger mode 'point out' requires a physical connection inbetween the devices 'Sync Out AWG A' and 'Trig In AWG C' outputs.")
+        # reading the trigger channel is a device query, only done if the message is logged
+        if log.isEnabledFor(logging.INFO):
+            log.info("Fast 2D scan trigger now set to 'point out', using DAC channel %s.", self.trigger_channel.get())
 
     #-------------------------------------------------
 
@@ -1054,15 +987,13 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         """
 
         if self.__awg_xy == "a":
-            step_size = self.__controller.get_ramp_step_size(self.__awg_xy)
-            number_steps = self.__controller.get_ramp_cycle_steps(self.__awg_xy)
-            start_voltage = self.__controller.get_ramp_starting_voltage(self.__awg_xy)
+            start_voltage, step_size, number_steps = self.__controller.get_ramp_params(self.__awg_xy)
 
-            waveform = []
-            for step in range(0, number_steps):
-                waveform.append(round(start_voltage + (step * step_size), 6))
-            
-            return array(waveform, dtype = float)
+            # computed in place to avoid temporary arrays
+            x_axis = arange(number_steps, dtype = float64)
+            x_axis *= step_size
+            x_axis += start_voltage
+            return around(x_axis, 6, out = x_axis)
         else:
             return array([], dtype = float)
         
@@ -1076,15 +1007,14 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         ndarray: numpy array with voltage steps in V (+/- 10.000000 V)
         """
 
+        awga = self.parent.awga
+
         if self.__awg_xy == "a":
-            self.parent.awga.locked = False
-            waveform = self.parent.awga.waveform.get()
-            self.parent.awga.locked = True
+            with awga.unlocked():
+                waveform = awga.waveform.get()
 
             # delete last element (returns to starting value)
-            waveform = list(waveform)
-            waveform.pop()
-            return array(waveform)
+            return waveform[:-1]
         else:
             return array([], dtype = float)
         
@@ -1098,19 +1028,21 @@ class BaspiLnhrdac2Fast2d(InstrumentModule):
         enable: start or stop 2D-scan
         """
 
+        awga = self.parent.awga
+        awgb = self.parent.awgb
+
         if enable:
             if self.__awg_xy == "a":
-                self.parent.awga.locked = False
-                self.parent.awga.enable.set(True)
-                self.parent.awga.locked = True
-                self.parent.awgb.locked = True
-                print(f"Fast adaptive 2D scan started with configuration {self.__current_config}.")
+                with awga.unlocked():
+                    awga.enable.set(True)
+                awgb.locked = True
+                log.info("Fast adaptive 2D scan started with configuration %s.", self.__current_config)
         elif self.__awg_xy == "a":
             self.__awg_xy = None
             self.__current_config = None
-            self.parent.awga.locked = False
-            self.parent.awgb.locked = False
-            print(f"Fast adaptive 2D scan stopped. All AWGs can be used normally again.")
+            awga.locked = False
+            awgb.locked = False
+            log.info("Fast adaptive 2D scan stopped. All AWGs can be used normally again.")
             
 
 # class ----------------------------------------------------------------
@@ -1134,9 +1066,11 @@ class BaspiLnhrdac2(VisaInstrument):
         # to only have a single interface to the device
         self.__controller = BaspiLnhrdac2Controller(self)
 
+        # identification information does not change while connected
+        self.__idn = None
+
         # visa properties for communication
-        self.visa_handle.write_termination = "\r\n"
-        self.visa_handle.read_termination = "\r\n"
+        self.__setup_visa_handle()
 
         # get number of physicallly available channels
         # for correct further initialization
@@ -1145,36 +1079,29 @@ class BaspiLnhrdac2(VisaInstrument):
         if self.number_channels != 12 and self.number_channels != 24:
             raise SystemError("Physically available number of channels is not 12 or 24. Please check device.")
 
-        # create channels and add to instrument
-        # save references for later grouping
-        channels = {}
-        for channel_number in range(1, self.number_channels + 1):
-            name = f"ch{channel_number}"
-            channel = BaspiLnhrdac2Channel(self, name, channel_number, self.__controller)
-            channels.update({name: channel})
-            self.add_submodule(name, channel)
+        # set initial values of all channels (0.0 V, low bandwidth, off) 
+        # with a single command each instead of three commands per channel
+        self.__controller.set_all_dacvalue(BaspiLnhrdac2Controller.vval_to_dacval(0.0))
+        self.__controller.set_all_bandwidth("LBW")
+        self.__controller.set_all_status("OFF")
 
+        # create channels and add to instrument,
         # grouping channels to simplify simoultaneous access
         all_channels = ChannelList(self, "all channels", BaspiLnhrdac2Channel)
         for channel_number in range(1, self.number_channels + 1):
-            channel = channels[f"ch{channel_number}"]
+            name = f"ch{channel_number}"
+            channel = BaspiLnhrdac2Channel(self, name, channel_number, self.__controller)
+            self.add_submodule(name, channel)
             all_channels.append(channel)
 
         self.add_submodule("all", all_channels)
 
+        # channel groups per DAC board only on the 24 channel version
         if self.number_channels == 24:
-            lower_board = ChannelList(self, "lower board", BaspiLnhrdac2Channel)
-            for channel_number in range(1, 12 + 1):
-                channel = channels[f"ch{channel_number}"]
-                lower_board.append(channel)
-
+            lower_board = ChannelList(self, "lower board", BaspiLnhrdac2Channel, all_channels[:12])
             self.add_submodule("lower_board", lower_board)
 
-            higher_board = ChannelList(self, "higher board", BaspiLnhrdac2Channel)
-            for channel_number in range(13, 24 + 1):
-                channel = channels[f"ch{channel_number}"]
-                higher_board.append(channel)
-
+            higher_board = ChannelList(self, "higher board", BaspiLnhrdac2Channel, all_channels[12:])
             self.add_submodule("higher board", higher_board)
 
         # AWGs dependent on 12/24 channel version
@@ -1214,6 +1141,10 @@ class BaspiLnhrdac2(VisaInstrument):
         Returns:
         dict: contains all QCodes required IDN fields
         """
+
+        if self.__idn is not None:
+            return dict(self.__idn)
+
         vendor = "Basel Precision Instruments GmbH (BASPI)"
         model = f"LNHR DAC II (SP1060) - {self.number_channels} channel version"
 
@@ -1228,8 +1159,68 @@ class BaspiLnhrdac2(VisaInstrument):
             "serial": serial,
             "firmware": firmware
         }
+        self.__idn = idn
+
+        return dict(idn)
+
+    #-------------------------------------------------
+
+    def set_voltages_synchronously(self, voltages: dict[int, float], board: str = "LH") -> None:
+        """
+        Set the voltages of multiple channels and update the channels of a DAC 
+        board synchronously afterwards, with a single transfer. The cached 
+        values of the voltage parameters are updated as well. The channels 
+        are only updated together if the update mode of the board is synchronous.
+
+        Parameters:
+        voltages: voltage in V per channel number (+/- 10.0 V)
+        board: higher DAC board ("H"), lower DAC board ("L"), or both ("LH")
+        """
+
+        channels = {channel_number: self.submodules[f"ch{channel_number}"] for channel_number in voltages}
+        for channel_number, voltage in voltages.items():
+            channels[channel_number].voltage.validate(voltage)
 
-        return idn
+        dacvalues = BaspiLnhrdac2Controller.vvals_to_dacvals(list(voltages.values()))
+        self.__controller.set_and_sync(dict(zip(voltages, dacvalues.tolist())), board)
+
+        for channel_number, voltage in voltages.items():
+            channels[channel_number].voltage.cache.set(voltage)
+
+    #-------------------------------------------------
+
+    def refresh_channels(self) -> None:
+        """
+        Read the voltage, status and bandwidth of all channels from the device 
+        with a single transfer and update the cached values of the channel 
+        parameters. Afterwards e.g. snapshot(update = False) reflects the 
+        current device state without querying every channel on its own.
+        """
+
+        voltages, statuses, bandwidths = self.__controller.get_all_channel_states()
+
+        for channel, voltage, status, bandwidth in zip(self.all, voltages.tolist(), statuses, bandwidths):
+            channel.voltage.cache.set(voltage)
+            channel.enable.cache.set(status == "ON")
+            channel.high_bandwidth.cache.set(bandwidth == "HBW")
+
+    #-------------------------------------------------
+
+    def __setup_visa_handle(self) -> None:
+        """
+        Set the visa properties for the communication with the device. 
+        Nagle's algorithm is disabled, so that short commands and queries 
+        are sent immediately instead of being held back by the TCP stack
+        """
+
+        self.visa_handle.write_termination = "\r\n"
+        self.visa_handle.read_termination = "\r\n"
+
+        try:
+            self.visa_handle.set_visa_attribute(ResourceAttribute.tcpip_nodelay, True)
+        except (VisaIOError, NotImplementedError):
+            # attribute not supported by the visa backend, keep its default
+            pass
     
     # ------------------------------------------------------------
     def reconnect(
@@ -1251,7 +1242,8 @@ class BaspiLnhrdac2(VisaInstrument):
             How many times the driver should retry the whole reconnect
             sequence (open VISA + IDN query). Must be >= 1.
         wait_between_attempts : float
-            Delay in seconds between reconnect attempts. Must be >= 0.
+            Delay in seconds between the starts of two reconnect attempts,
+            the time spent on a failed attempt is subtracted. Must be >= 0.
         """
 
         # validate input
@@ -1293,6 +1285,7 @@ class BaspiLnhrdac2(VisaInstrument):
 
         # reconnect in a loop 
         for attempt in range(1, attempts + 1):
+            attempt_start = monotonic()
             try:
                 # new visa rescource
                 visa_handle, visabackend, resource_manager = self._open_resource(
@@ -1304,11 +1297,13 @@ class BaspiLnhrdac2(VisaInstrument):
                 self.visabackend = visabackend
                 self.resource_manager = resource_manager
 
-                # restore terminations for dac
-                self.visa_handle.write_termination = "\r\n"
-                self.visa_handle.read_termination = "\r\n"
+                # restore visa properties for dac
+                self.__setup_visa_handle()
 
-                # get idn to verify connection
+                # the device might have been reset, forget all cached information.
+                # get idn to verify connection, always read from the device
+                self.__idn = None
+                self.__controller.clear_caches()
                 idn = self.get_idn()
 
                 # confirmation that everything worked
@@ -1337,14 +1332,16 @@ class BaspiLnhrdac2(VisaInstrument):
                         pass
 
                 if attempt < attempts:
+                    # a failed attempt (e.g. a timeout) already used up part of the delay
+                    remaining = max(0.0, wait_between_attempts - (monotonic() - attempt_start))
                     print(
                         f"[BaspiLnhrdac2.reconnect] Reconnect attempt "
                         f"{attempt}/{attempts} failed.\n"
                         "Please now ensure that the Telnet server on the LNHR DAC II "
                         "has been restarted.\n"
-                        f"Waiting {wait_between_attempts:.1f} s before the next try...\n"
+                        f"Waiting {remaining:.1f} s before the next try...\n"
                     )
-                    sleep(wait_between_attempts)
+                    sleep(remaining)
                 else:
                     # no more attempts left, give notification and reason to error
                     raise RuntimeError(
@@ -12,10 +12,35 @@
 
 # imports --------------------------------------------------------------
 
-from typing import Optional
-from time import sleep
+from typing import Optional, Iterator, Callable
+from time import sleep, monotonic
+from contextlib import contextmanager
+from threading import RLock, local
+from numpy import ndarray, asarray, fromiter, rint, around, float64, int64
 from qcodes.instrument import VisaInstrument
+
+# logging --------------------------------------------------------------
+
+import logging
+
+log = logging.getLogger(__name__)
         
+# constants ------------------------------------------------------------
+
+# combined start/stop commands of multiple AWGs
+_AWG_GROUPS = {frozenset("AB"): "AB", frozenset("CD"): "CD", frozenset("ABCD"): "all"}
+
+# class ----------------------------------------------------------------
+
+class _BatchState(local):
+    """
+    Set commands collected by BaspiLnhrdac2Controller.batch(). Each thread 
+    collects its own commands, commands of other threads are sent as usual
+    """
+
+    commands: Optional[list[str]] = None
+    max_size: int = 0
+
 # class ----------------------------------------------------------------
 
 class BaspiLnhrdac2Controller():
@@ -37,6 +62,30 @@ class BaspiLnhrdac2Controller():
         self.__ctrl_cmd_delay = 0.2
         self.__mem_write_delay = 0.3
 
+        # earliest time the next command may be sent, set by control commands
+        self.__ready_time = 0.0
+
+        # wave memories written by "C WAV-x WRITE", checked before the next command
+        self.__busy_wavs = set()
+
+        # last known AWG clock periods per DAC board, cleared by all
+        # commands which can change the clock period
+        self.__clock_periods = {}
+
+        # set commands collected by batch() per thread, commands is None if not batching
+        self.__batch = _BatchState()
+
+        # answers of queries for static device information (firmware, serial, ...)
+        self.__static_cache = {}
+
+        # recently read device states (run states, availabilities, memory sizes, ...), cleared by every set command
+        self.__state_cache = {}
+        self.__state_cache_lifetime = 0.05
+
+        # serializes the communication of multiple threads, a transfer 
+        # or a query and its answer are never interleaved with other commands
+        self.__io_lock = RLock()
+
     #-------------------------------------------------
 
     @staticmethod
@@ -71,6 +120,40 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
+    @staticmethod
+    def vvals_to_dacvals(vvals: ndarray) -> ndarray:
+        """
+        Convert multiple LNHR DAC II voltages into internal values at once.
+
+        Parameters:
+        vvals: voltage values in V
+
+        Returns:
+        ndarray: integer values, used internally by the DAC
+        """
+
+        return rint((asarray(vvals, dtype = float64) + 10.000000) * 838860.74).astype(int64)
+
+    #-------------------------------------------------
+
+    @staticmethod
+    def dacvals_to_vvals(dacvals: list[str]) -> ndarray:
+        """
+        Convert multiple LNHR DAC II internal hexadecimal values into voltages at once.
+
+        Parameters:
+        dacvals: hexadecimal values, used internally by the DAC
+
+        Returns:
+        ndarray: voltage values in V
+        """
+
+        dacvals = fromiter((int(dacval, 16) for dacval in dacvals), dtype = int64, count = len(dacvals))
+
+        return around((dacvals / 838860.74) - 10.000000, 6)
+
+    #-------------------------------------------------
+
     def write(self, command: str) -> Optional[str]:
         """
         Sends a command or a query to the device. This method overrides 
@@ -86,25 +169,403 @@ class BaspiLnhrdac2Controller():
         KeyError: command couldn't be processed by the device
         """
 
-        answer = self.__instrument.ask(command)
+        with self.__io_lock:
+            # all queries end with "?"
+            is_query = command.endswith("?")
+
+            if not is_query:
+                self.__state_cache.clear()
+
+            # inside batch() set commands are collected and queries are 
+            # only sent after all collected commands have been processed
+            if self.__batch.commands is not None:
+                if not is_query:
+                    self.__batch.commands.append(command)
+                    if len(self.__batch.commands) >= self.__batch.max_size:
+                        self.__flush_batch()
+                    return "0"
+                self.__flush_batch()
+
+            self.__wait_until_ready()
+            answer = self.__instrument.ask(command)
+            self.__check_answer(command, answer, is_query)
+            if not is_query:
+                self.__wait_after_command(self.__command_delay(command))
+                wav = self.__written_wav(command)
+                if wav is not None:
+                    self.__busy_wavs.add(wav)
+
+            return answer
+
+    #-------------------------------------------------
+
+    def __command_delay(self, command: str) -> float:
+        """
+        Time the device needs after a set command for internal synchronisation 
+        of all the devices variables. Control commands need a delay, the SWG 
+        writing a wave memory (APPLY) needs an additional delay. The end of a 
+        wave memory write (WRITE) is detected by its busy flag instead
+        """
+
+        if command[0] not in ("c", "C"):
+            return 0.0
+        if command[-5:].upper() == "APPLY":
+            return self.__ctrl_cmd_delay + self.__mem_write_delay
+        return self.__ctrl_cmd_delay
+
+    #-------------------------------------------------
+
+    @staticmethod
+    def __written_wav(command: str) -> Optional[str]:
+        """
+        Wave memory which is written into the AWG memory by a command 
+        ("C WAV-x WRITE"), None for all other commands
+        """
+
+        if command[-5:].upper() == "WRITE" and command[:6].upper() == "C WAV-":
+            return command[6]
+        return None
+
+    #-------------------------------------------------
+
+    def __wait_after_command(self, delay: float) -> None:
+        """
+        Wait to allow for internal synchronisation of all the devices 
+        variables. The wait is deferred until the next command is sent, 
+        see __wait_until_ready()
+        """
+
+        if delay:
+            self.__ready_time = monotonic() + delay
+
+    #-------------------------------------------------
+
+    def __wait_until_ready(self) -> None:
+        """
+        Wait for the remaining synchronisation time of the last control 
+        command. Time which already passed in between the two commands 
+        is not waited again
+        """
+
+        remaining = self.__ready_time - monotonic()
+        if remaining > 0.0:
+            sleep(remaining)
+
+        if self.__busy_wavs:
+            self.__wait_wavs_written()
+
+    #-------------------------------------------------
+
+    def __wait_wavs_written(self) -> None:
+        """
+        Poll the busy flags of the wave memories written since the last 
+        command, until they are cleared. The flags of all memories still 
+        busy are read in a single transfer per poll, with a doubling delay 
+        in between two polls. Never waits longer than the fixed memory write 
+        delay, which has been used instead of polling before. A warning is 
+        logged if a memory is still busy afterwards
+
+        Raises:
+        KeyError: a busy flag couldn't be read
+        """
+
+        visa_handle = self.__instrument.visa_handle
+        busy_wavs = list(self.__busy_wavs)
+
+        def written() -> bool:
+            commands = [f"C WAV-{wav} BUSY?" for wav in busy_wavs]
+            visa_handle.write(visa_handle.write_termination.join(commands))
+            answers = [visa_handle.read() for _ in commands]
+            for command, answer in zip(commands, answers):
+                self.__check_answer(command, answer, True)
+            busy_wavs[:] = [wav for wav, answer in zip(busy_wavs, answers) if answer != "0"]
+            return not busy_wavs
+
+        try:
+            if not self.__wait_until(written, self.__mem_write_delay):
+                log.warning("Wave memories %s still busy after %s s, sending the next command anyway.",
+                            ", ".join(busy_wavs), self.__mem_write_delay)
+        finally:
+            self.__busy_wavs.clear()
+
+    #-------------------------------------------------
+
+    @staticmethod
+    def __wait_until(predicate: Callable[[], bool], timeout: Optional[float], 
+                     initial_delay: float = 0.005, max_delay: float = 0.05) -> bool:
+        """
+        Poll a condition until it is fulfilled or the timeout has passed. 
+        The delay in between two polls is doubled after every poll, to not 
+        flood the device with queries during long waits. The last sleep is 
+        shortened to end at the deadline, so the wait never overshoots the 
+        timeout by more than one poll
+
+        Parameters:
+        predicate: condition to poll, returns True if fulfilled
+        timeout: maximum time to wait in s, None to wait without limit
+        initial_delay: delay after the first poll in s
+        max_delay: upper limit of the delay in between two polls in s
+
+        Returns:
+        bool: condition fulfilled (True) or timeout passed (False)
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        delay = initial_delay
+        while not predicate():
+            if deadline is None:
+                sleep(delay)
+            else:
+                remaining = deadline - monotonic()
+                if remaining <= 0.0:
+                    return False
+                sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+        return True
+
+    #-------------------------------------------------
+
+    def __query_state(self, command: str) -> str:
+        """
+        Sends a state query to the device. Answers are reused for 50 ms, 
+        as long as no set command has been sent in the meantime, to avoid 
+        repeated round trips when the same state is checked multiple times
+
+        Parameters:
+        command: query as per programmers manual of the device
+
+        Returns:
+        string: answer of the device
+        """
+
+        with self.__io_lock:
+            timestamp, answer = self.__state_cache.get(command, (None, None))
+            if timestamp is not None and monotonic() - timestamp < self.__state_cache_lifetime:
+                return answer
 
-        # handshaking: check for succesful acknowledge/ valid answer
-        if not "?" in command:
+            timestamp = monotonic()
+            answer = self.write(command)
+            self.__state_cache[command] = (timestamp, answer)
+
+            return answer
+
+    #-------------------------------------------------
+
+    def __query_static(self, command: str, clear: bool = True) -> str:
+        """
+        Sends a query for device information which does not change while 
+        the device is running. The answer is only read from the device once, 
+        see clear_caches()
+
+        Parameters:
+        command: query as per programmers manual of the device
+        clear: clear the VISA buffers after the multiline answer
+
+        Returns:
+        string: answer of the device
+        """
+
+        with self.__io_lock:
+            answer = self.__static_cache.get(command)
+            if answer is None:
+                answer = self.write(command)
+                if clear:
+                    self.__instrument.visa_handle.clear()
+                self.__static_cache[command] = answer
+
+            return answer
+
+    #-------------------------------------------------
+
+    def clear_caches(self) -> None:
+        """
+        Forget all cached device information: static information (firmware, 
+        serial, IP address, ...), recently read device states and AWG clock 
+        periods, e.g. after a firmware update or a reconnect. The information 
+        is read from the device again on the next query
+        """
+
+        with self.__io_lock:
+            self.__static_cache.clear()
+            self.__state_cache.clear()
+            self.__clock_periods.clear()
+
+    #-------------------------------------------------
+
+    @contextmanager
+    def batch(self, max_size: int = 1000) -> Iterator[None]:
+        """
+        Collect all set commands sent by write() inside the with-block. Only 
+        non-control commands (e.g. channel values) are coalesced: they are sent 
+        in a single transfer together with the next control command. Every 
+        control command ("C ...") still ends its transfer and is followed by 
+        the synchronisation delay, so a sequence of control commands is sent 
+        one by one as without batch(). The collected commands are sent before 
+        the next query, before write_many(), when max_size commands have been 
+        collected and when leaving the with-block. Nested batches are merged 
+        into the outermost one. Only commands of the calling thread are 
+        collected, the with-block should only contain short sequences of 
+        set commands
+
+        Parameters:
+        max_size: maximum number of commands sent in a single transfer, 
+            bounds the size of the transfer and of the read back answers
+
+        Raises:
+        KeyError: a collected command couldn't be processed by the device
+        """
+
+        if self.__batch.commands is not None:
+            yield
+            return
+
+        self.__batch.commands = []
+        self.__batch.max_size = max(1, max_size)
+        try:
+            yield
+        finally:
+            try:
+                self.__flush_batch()
+            finally:
+                self.__batch.commands = None
+
+    #-------------------------------------------------
+
+    def __flush_batch(self) -> None:
+        """
+        Send the commands collected by batch() to the device.
+
+        Raises:
+        KeyError: a command couldn't be processed by the device
+        """
+
+        commands = self.__batch.commands
+        if not commands:
+            return
+        self.__batch.commands = []
+
+        # control commands need the synchronisation delay before the next 
+        # command, each transfer therefore ends with a control command
+        with self.__io_lock:
+            start = 0
+            for end, command in enumerate(commands, 1):
+                delay = self.__command_delay(command)
+                if delay or end == len(commands):
+                    self.__write_many(commands[start:end])
+                    self.__wait_after_command(delay)
+                    wav = self.__written_wav(command)
+                    if wav is not None:
+                        self.__busy_wavs.add(wav)
+                    start = end
+
+    #-------------------------------------------------
+
+    def write_many(self, commands: list[str]) -> list[str]:
+        """
+        Sends multiple commands or queries to the device in a single VISA
+        transfer. The device processes the commands line by line and the
+        answers are read back afterwards. The transfer waits for a pending 
+        delay of a previous control command, but no delay is applied after
+        the transfer, therefore control commands must be sent using write()
+
+        Parameters:
+        commands: commands as per programmers manual of the device
+
+        Returns:
+        list: answers of the device, one per command
+
+        Raises:
+        KeyError: a command couldn't be processed by the device
+        """
+
+        with self.__io_lock:
+            if self.__batch.commands:
+                self.__flush_batch()
+
+            return self.__write_many(commands)
+
+    #-------------------------------------------------
+
+    def __write_many(self, commands: list[str]) -> list[str]:
+        """
+        Sends multiple commands or queries to the device in a single VISA 
+        transfer, see write_many().
+        """
+
+        if not commands:
+            return []
+
+        set_commands = [not command.endswith("?") for command in commands]
+        if any(set_commands):
+            self.__state_cache.clear()
+
+        self.__wait_until_ready()
+        visa_handle = self.__instrument.visa_handle
+        visa_handle.write(visa_handle.write_termination.join(commands))
+        if all(set_commands):
+            answers = self.__read_acknowledges(len(commands))
+            # check all acknowledges at once, the failing command is only searched on error
+            if answers.count("0") == len(answers):
+                return answers
+        else:
+            answers = [visa_handle.read() for _ in commands]
+
+        for command, answer, is_set in zip(commands, answers, set_commands):
+            self.__check_answer(command, answer, not is_set)
+
+        return answers
+
+    #-------------------------------------------------
+
+    def __read_acknowledges(self, count: int) -> list[str]:
+        """
+        Read the acknowledges of multiple set commands with a single read.
+        Every answer is at least one character and the read termination long,
+        so reading this many bytes never reads past the last acknowledge. 
+        Longer answers are completed line by line
+
+        Parameters:
+        count: number of acknowledges to read
+
+        Returns:
+        list: answers of the device, one per command
+        """
+
+        visa_handle = self.__instrument.visa_handle
+        termination = visa_handle.read_termination
+        data = visa_handle.read_bytes(count * (1 + len(termination))).decode(visa_handle.encoding)
+
+        # all commands acknowledged
+        if data == ("0" + termination) * count:
+            return ["0"] * count
+
+        answers = data.split(termination)
+        incomplete = answers.pop()
+        if incomplete:
+            answers.append((incomplete + visa_handle.read()).removesuffix(termination))
+        answers.extend(visa_handle.read() for _ in range(count - len(answers)))
+
+        return answers
+
+    #-------------------------------------------------
+
+    @staticmethod
+    def __check_answer(command: str, answer: str, is_query: bool) -> None:
+        """
+        Handshaking: check for succesful acknowledge/ valid answer of the device.
+
+        Raises:
+        KeyError: command couldn't be processed by the device
+        """
+
+        if not is_query:
             if answer != "0":
-                raise KeyError(f"Command ({command}) could not be processed by the device")
+                raise KeyError(f"Command ({command}) could not be processed by the device (DAC-Error Code {answer})")
         else:
             if "?" in answer:
                 raise KeyError(f"Command ({command}) could not be processed by the device")
 
-        # in case of a control command wait to allow for internal 
-        # synchronisation of all the devices variables
-        if command[0].lower() == "c":
-            sleep(self.__ctrl_cmd_delay)
-            if "write" or "apply" in command:
-                sleep(self.__mem_write_delay)
-
-        return answer
-    
     #-------------------------------------------------
 
     ##################################################
@@ -127,7 +588,7 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        return self.write(f"{channel:0} {dacvalue:x}")
+        return self.write("%d %x" % (channel, dacvalue))
     
     #-------------------------------------------------
 
@@ -231,7 +692,7 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        return self.write(f"awg-{memory} {address:x} {dacvalue:x}")
+        return self.write("awg-%s %x %x" % (memory, address, dacvalue))
 
     #-------------------------------------------------
 
@@ -250,6 +711,32 @@ class BaspiLnhrdac2Controller():
         return self.write(f"awg-{memory} ALL {dacvalue:x}")
 
     #-------------------------------------------------
+
+    def set_awg_memory_values(self, memory: str, start_address: int, dacvalues: list[int] | ndarray) -> list[str]:
+        """
+        Set consecutive AWG memory addresses to specific values. All values
+        are sent to the device in a single transfer
+
+        Parameters:
+        memory: AWG memory to write into ("A", "B", "C" or "D")
+        start_address: hexadecimal memory address of the first value (0x0 - 0x84CF)
+        dacvalues: hexadecimal values (0x0 - 0xFFFFFF)
+
+        Returns:
+        list: DAC-Error Codes ("0" - "5"), one per value. "0" is always "no error"
+        """
+
+        # formatting python ints is faster than formatting numpy scalars
+        if isinstance(dacvalues, ndarray):
+            dacvalues = dacvalues.tolist()
+
+        # %-formatting is faster than f-strings for these short numeric commands
+        commands = ["awg-%s %x %x" % (memory, address, dacvalue)
+                    for address, dacvalue in enumerate(dacvalues, start_address)]
+
+        return self.write_many(commands)
+
+    #-------------------------------------------------
     
     ##################################################
 
@@ -289,7 +776,33 @@ class BaspiLnhrdac2Controller():
         """
 
         return self.write(f"wav-{memory} all {voltage:.6f}")
-    
+
+    #-------------------------------------------------
+
+    def set_wav_memory_values(self, memory: str, start_address: int, voltages: list[float] | ndarray) -> list[str]:
+        """
+        Set consecutive wave memory addresses to specific values. All values
+        are sent to the device in a single transfer
+
+        Parameters:
+        memory: AWG memory to write into ("A", "B", "C" or "D")
+        start_address: hexadecimal memory address of the first value (0x0 - 0x84CF)
+        voltages: voltage values (+/- 10.000000 V)
+
+        Returns:
+        list: DAC-Error Codes ("0" - "5"), one per value. "0" is always "no error"
+        """
+
+        # formatting python floats is faster than formatting numpy scalars
+        if isinstance(voltages, ndarray):
+            voltages = voltages.tolist()
+
+        # %-formatting is faster than f-strings for these short numeric commands
+        commands = ["wav-%s %x %.6f" % (memory, address, voltage)
+                    for address, voltage in enumerate(voltages, start_address)]
+
+        return self.write_many(commands)
+
     #-------------------------------------------------
     
     ##################################################
@@ -300,7 +813,7 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
-    def set_polynomial(self, memory: str, coefficients: list[float:.6]) -> str:
+    def set_polynomial(self, memory: str, coefficients: list[float]) -> str:
         """
         Set polynomial coefficients. The polynomial can be applied to 
         the values of the AWG memory when the wave memory is copied into 
@@ -315,10 +828,7 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        coefficient_string = ""
-
-        for element in coefficients:
-            coefficient_string = coefficient_string + f" {str(element)}"
+        coefficient_string = "".join(f" {element}" for element in coefficients)
 
         return self.write(f"poly-{memory}{coefficient_string}")
     
@@ -360,6 +870,19 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
+    def get_all_voltages(self) -> ndarray:
+        """
+        Read the present value of all DAC channels and convert them into
+        voltages at once
+
+        Returns:
+        ndarray: voltage values (+/- 10.000000 V) of all channels
+        """
+
+        return self.dacvals_to_vvals(self.write("all v?").replace("\r\n","").split(';'))
+
+    #-------------------------------------------------
+
     def get_channel_dacvalue_registered(self, channel: int) -> str:
         """
         Read the registered value of a specified channel. This is the 
@@ -444,6 +967,24 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
+    def get_all_channel_states(self) -> tuple[ndarray, list, list]:
+        """
+        Read the voltage, the status and the bandwidth of all DAC channels. 
+        All queries are sent in a single transfer
+
+        Returns:
+        ndarray: voltage values (+/- 10.000000 V) of all channels
+        list: statuses ("ON" or "OFF") of all channels
+        list: bandwidth modes ("LBW" or "HBW") of all channels
+        """
+
+        answers = self.write_many(["all v?", "all s?", "all bw?"])
+        dacvalues, statuses, bandwidths = (answer.replace("\r\n","").split(';') for answer in answers)
+
+        return self.dacvals_to_vvals(dacvalues), statuses, bandwidths
+
+    #-------------------------------------------------
+
     def get_channel_mode(self, channel: int) -> str:
         """
         Read the current DAC mode of a specific DAC channel
@@ -535,6 +1076,26 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
+    def get_wav_memory_blocks(self, memory: str, block_start_addresses: list[int]) -> list[list]:
+        """
+        Read the values of multiple wave memory blocks (1000 values each). 
+        All queries are sent to the device in a single transfer and the
+        answers are read back afterwards
+
+        Parameters:
+        memory: AWG memory to read out of ("A", "B", "C" or "D")
+        block_start_addresses: hexadecimal memory addresses (0x0 - 0x84CF)
+
+        Returns:
+        list: one list of values per memory block
+        """
+
+        answers = self.write_many([f"wav-{memory} {address:x} blk?" for address in block_start_addresses])
+
+        return [answer.replace("\r\n","").split(';') for answer in answers]
+
+    #-------------------------------------------------
+
     def get_polynomial(self, memory: str) -> list:
         """
         Read polynomial coefficients. The polynomial can be applied to 
@@ -570,8 +1131,7 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output
 
-        ans = self.write("?")
-        self.__instrument.visa_handle.clear()
+        ans = self.__query_static("?")
 
         return ans
     
@@ -586,8 +1146,7 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output
 
-        ans = self.write("help?")
-        self.__instrument.visa_handle.clear()
+        ans = self.__query_static("help?")
 
         return ans
     
@@ -602,8 +1161,7 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output
        
-        ans = self.write("soft?")
-        self.__instrument.visa_handle.clear()
+        ans = self.__query_static("soft?")
 
         return ans 
 
@@ -618,8 +1176,7 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output
 
-        ans = self.write("hard?")
-        self.__instrument.visa_handle.clear()
+        ans = self.__query_static("hard?")
 
         return ans
     
@@ -635,8 +1192,9 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output, 
 
-        ans = self.write("health?")
-        self.__instrument.visa_handle.clear()
+        with self.__io_lock:
+            ans = self.write("health?")
+            self.__instrument.visa_handle.clear()
 
         return ans
 
@@ -651,8 +1209,7 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output, 
 
-        ans = self.write("ip?")
-        self.__instrument.visa_handle.clear()
+        ans = self.__query_static("ip?")
 
         return ans
     
@@ -667,8 +1224,7 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output, 
 
-        ans = self.write("serial?")
-        
+        ans = self.__query_static("serial?", clear = False)
 
         return ans
 
@@ -683,8 +1239,7 @@ class BaspiLnhrdac2Controller():
         """
         # TODO: check multiline output, 
 
-        ans = self.write("contact?")
-        self.__instrument.visa_handle.clear()
+        ans = self.__query_static("contact?")
 
         return ans
     
@@ -747,6 +1302,32 @@ class BaspiLnhrdac2Controller():
         return self.write(f"C SYNC-{board}")
 
     #-------------------------------------------------
+
+    def set_and_sync(self, channel_dacvalues: dict[int, int], board: str = "LH") -> str:
+        """
+        Set multiple DAC channels to specific values and update the channels 
+        of a DAC board synchronously afterwards. All commands are sent in a 
+        single transfer and the delay after the control command is applied 
+        once. The channels are only updated together if the update mode of 
+        the board is synchronous, see set_board_update_mode()
+
+        Parameters:
+        channel_dacvalues: hexadecimal values (0x0 - 0xFFFFFF) per DAC channel
+        board: higher DAC board ("H"), lower DAC board ("L"), 
+            or both ("LH")
+
+        Returns:
+        string: DAC-Error Code ("0" - "5"). "0" is always "no error"
+        """
+
+        with self.batch():
+            for channel, dacvalue in channel_dacvalues.items():
+                self.set_channel_dacvalue(channel, dacvalue)
+            answer = self.update_board_channels(board)
+
+        return answer
+
+    #-------------------------------------------------
     
     ##################################################
 
@@ -784,7 +1365,7 @@ class BaspiLnhrdac2Controller():
             or on hold (3)
         """
         
-        return int(self.write(f"C RMP-{ramp} S?"))
+        return int(self.__query_state(f"C RMP-{ramp} S?"))
 
     #-------------------------------------------------
 
@@ -852,6 +1433,29 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
+    def get_ramp_params(self, ramp: str) -> tuple[float, float, int]:
+        """
+        Read the starting voltage, the internally calculated step size and
+        the steps per ramp cycle of a ramp/step generator. All queries are
+        sent in a single transfer
+
+        Parameters:
+        ramp: ramp/step generator ("A", "B", "C" or "D")
+
+        Returns:
+        float: starting voltage (+/- 10.000000 V)
+        float: step size in V/step (+/- 10.000000 V)
+        int: number of steps per cycle (0 - 200000000)
+        """
+
+        start, step, steps = self.write_many([f"C RMP-{ramp} STAV?",
+                                              f"C RMP-{ramp} SSV?",
+                                              f"C RMP-{ramp} ST?"])
+
+        return round(float(start), 6), round(float(step), 6), int(steps)
+
+    #-------------------------------------------------
+
     def get_ramp_channel_availability(self, ramp: str) -> bool:
         """
         Read if the associated DAC channel of a ramp/step generator is 
@@ -865,7 +1469,7 @@ class BaspiLnhrdac2Controller():
             or not available (False)
         """
 
-        return bool(int(self.write(f"C RMP-{ramp} AVA?")))
+        return self.__query_state(f"C RMP-{ramp} AVA?") == "1"
 
     #-------------------------------------------------
 
@@ -1077,7 +1681,7 @@ class BaspiLnhrdac2Controller():
         bool: RAMP mode (True) or STEP (False)
         """
 
-        return not bool(int(self.write(f"C RMP-{ramp} STEP?")))
+        return self.write(f"C RMP-{ramp} STEP?") == "0"
 
     #-------------------------------------------------
 
@@ -1255,6 +1859,35 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
+    def set_2d_scan_mode(self, awg: str, shift_voltage: float) -> str:
+        """
+        Set up an AWG for a 2D-scan: the AWG is auto-started after each step 
+        of its associated step generator. With a shift voltage other than 0 V 
+        the scan is adaptive: the AWG is set to reload-mode, the polynomial 
+        is applied and its constant coefficient is set to the shift voltage. 
+        Must not be changed if a 2D-scan is running
+
+        Parameters:
+        awg: AWG ("A", "B", "C" or "D")
+        shift_voltage: shift voltage per step (+/- 10.000000 V), 
+            0 V for a non adaptive scan
+
+        Returns:
+        string: DAC-Error Code ("0" - "5") of the last command. "0" is always "no error"
+        """
+
+        adaptive = 1 if shift_voltage != 0.0 else 0
+
+        self.set_awg_start_mode(awg, 1)
+        self.set_awg_reload_mode(awg, adaptive)
+        answer = self.set_apply_polynomial(awg, adaptive)
+        if adaptive:
+            answer = self.set_adaptive_shift_voltage(awg, shift_voltage)
+
+        return answer
+
+    #-------------------------------------------------
+
     ##################################################
 
     # AWG CONTROL COMMANDS 
@@ -1276,7 +1909,7 @@ class BaspiLnhrdac2Controller():
         bool: normal mode (False) or AWG-only mode (True)
         """
 
-        return bool(int(self.write(f"C AWG-{board} ONLY?")))
+        return self.__query_state(f"C AWG-{board} ONLY?") == "1"
 
     #-------------------------------------------------
 
@@ -1314,6 +1947,36 @@ class BaspiLnhrdac2Controller():
     
     #-------------------------------------------------
 
+    def set_awgs_start_stop(self, awgs: list[str], command: str) -> str:
+        """
+        Start or stop multiple AWGs. Uses the combined "AB", "CD" or "all" 
+        command where possible, otherwise the single commands are sent 
+        one after another
+
+        Parameters:
+        awgs: AWGs ("A", "B", "C" or "D")
+        command: start or stop command ("start" or "stop")
+
+        Returns:
+        string: DAC-Error Code ("0" - "5"). "0" is always "no error"
+
+        Raises:
+        KeyError: a command couldn't be processed by the device
+        """
+
+        awgs = [awg.upper() for awg in awgs]
+        group = _AWG_GROUPS.get(frozenset(awgs))
+        if group is not None:
+            return self.set_awg_start_stop(group, command)
+
+        answer = "0"
+        for awg in dict.fromkeys(awgs):
+            answer = self.set_awg_start_stop(awg, command)
+
+        return answer
+
+    #-------------------------------------------------
+
     def get_awg_run_state(self, awg: str) -> bool:
         """
         Read the current state of operation of an AWG
@@ -1324,7 +1987,45 @@ class BaspiLnhrdac2Controller():
         Returns:
         bool: AWG is idle/not running (False) or AWG is running (True)
         """
-        return bool(int(self.write(f"C AWG-{awg} S?")))
+        return self.__query_state(f"C AWG-{awg} S?") == "1"
+    #-------------------------------------------------
+
+    def get_awgs_run_states(self, awgs: list[str]) -> list[bool]:
+        """
+        Read the current state of operation of multiple AWGs.
+        All queries are sent in a single transfer
+
+        Parameters:
+        awgs: AWGs ("A", "B", "C" or "D")
+
+        Returns:
+        list: AWGs are idle/not running (False) or running (True), one per AWG
+        """
+
+        return [answer == "1" for answer in self.write_many([f"C AWG-{awg} S?" for awg in awgs])]
+
+    #-------------------------------------------------
+
+    def get_awg_and_ramp_states(self, awgs: list[str]) -> tuple[list[bool], list[int]]:
+        """
+        Read the current state of operation of multiple AWGs and of their 
+        ramp/step generators. All queries are sent in a single transfer
+
+        Parameters:
+        awgs: AWGs and ramp/step generators ("A", "B", "C" or "D")
+
+        Returns:
+        list: AWGs are idle/not running (False) or running (True)
+        list: ramps are idle (0), ramping up (1), ramping down (2) 
+            or on hold (3)
+        """
+
+        answers = self.write_many([f"C AWG-{awg} S?" for awg in awgs] + [f"C RMP-{awg} S?" for awg in awgs])
+        awg_states = [answer == "1" for answer in answers[:len(awgs)]]
+        ramp_states = [int(answer) for answer in answers[len(awgs):]]
+
+        return awg_states, ramp_states
+
     #-------------------------------------------------
 
     def get_awg_cycles_done(self, awg: str) -> int: 
@@ -1343,6 +2044,24 @@ class BaspiLnhrdac2Controller():
     
     #-------------------------------------------------
 
+    def get_awgs_cycles_done(self, awgs: list[str]) -> ndarray:
+        """
+        Read the number of cycles that have been completed by multiple AWGs.
+        All queries are sent in a single transfer
+
+        Parameters:
+        awgs: AWGs ("A", "B", "C" or "D")
+
+        Returns:
+        ndarray: completed AWG cycles (0 - 4000000000), one per AWG
+        """
+
+        answers = self.write_many([f"C AWG-{awg} CD?" for awg in awgs])
+
+        return fromiter(map(int, answers), dtype = int64, count = len(answers))
+
+    #-------------------------------------------------
+
     def get_awg_duration(self, awg: str) -> float:
         """
         Read the internally calculated duration of one complete AWG cycle
@@ -1370,7 +2089,7 @@ class BaspiLnhrdac2Controller():
         bool: DAC channel is not available (False) or is available (True)
         """
 
-        return bool(int(self.write(f"C AWG-{awg} AVA?")))
+        return self.__query_state(f"C AWG-{awg} AVA?") == "1"
     
     #-------------------------------------------------
 
@@ -1416,7 +2135,7 @@ class BaspiLnhrdac2Controller():
         int: AWG memory size (2 - 34000)
         """
 
-        return int(self.write(f"C AWG-{awg} MS?"))
+        return int(self.__query_state(f"C AWG-{awg} MS?"))
 
     #-------------------------------------------------
 
@@ -1508,19 +2227,28 @@ class BaspiLnhrdac2Controller():
 
     #-------------------------------------------------
 
-    def get_awg_clock_period(self, board: str) -> int:
+    def get_awg_clock_period(self, board: str, cached: bool = False) -> int:
         """
         Read the AWG clock period of a DAC board (AWG-A/B or AWG-C/D) 
         in us (micro-seconds)
 
         Parameters:
         board: DAC board ("AB" or "CD")
+        cached: return the last read clock period instead of querying 
+            the device, if it has not been changed since
 
         Returns:
         int: clock period (10 us - 4000000000 us (micro-seconds))
         """
 
-        return int(self.write(f"C AWG-{board} CP?"))
+        with self.__io_lock:
+            if cached and board.lower() in self.__clock_periods:
+                return self.__clock_periods[board.lower()]
+
+            period = int(self.write(f"C AWG-{board} CP?"))
+            self.__clock_periods[board.lower()] = period
+
+            return period
 
     #-------------------------------------------------
 
@@ -1538,7 +2266,17 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        return self.write(f"C AWG-{board} CP {period}")
+        with self.__io_lock:
+            self.__clock_periods.pop(board.lower(), None)
+
+            answer = self.write(f"C AWG-{board} CP {period}")
+
+            # the device acknowledged the clock period, it does not have to be read back.
+            # Inside batch() the command has not been sent yet, the period is read on next use
+            if self.__batch.commands is None:
+                self.__clock_periods[board.lower()] = int(period)
+
+            return answer
     
     #-------------------------------------------------
 
@@ -1550,7 +2288,7 @@ class BaspiLnhrdac2Controller():
         string: reference clock on or off ("on" or "off")
         """
 
-        return self.write("C AWG-1MHz?")
+        return self.__query_state("C AWG-1MHz?")
 
     #-------------------------------------------------
 
@@ -1565,7 +2303,10 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        return self.write(f"C AWG-1MHz {state}")
+        with self.__io_lock:
+            self.__clock_periods.clear()
+
+            return self.write(f"C AWG-1MHz {state}")
 
     #-------------------------------------------------
 
@@ -1586,7 +2327,7 @@ class BaspiLnhrdac2Controller():
         bool: generate new waveform (True) or use saved waveform (False)
         """
 
-        return bool(int(self.write("C SWG MODE?")))
+        return self.write("C SWG MODE?") == "1"
 
     #-------------------------------------------------
 
@@ -1647,7 +2388,7 @@ class BaspiLnhrdac2Controller():
         float: desired frequency (0.001 Hz - 10 kHz)
         """
 
-        return float(self.write("C SWG DF?"))
+        return float(self.__query_state("C SWG DF?"))
 
     #-------------------------------------------------
 
@@ -1678,7 +2419,7 @@ class BaspiLnhrdac2Controller():
         int: keep AWG clock period (False) or adapt clock period (True)
         """
 
-        return bool(int(self.write("C SWG ACLK?")))
+        return self.write("C SWG ACLK?") == "1"
 
     #-------------------------------------------------
 
@@ -1696,7 +2437,10 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        return self.write(f"C SWG ACLK {int(adapt)}")
+        with self.__io_lock:
+            self.__clock_periods.clear()
+
+            return self.write(f"C SWG ACLK {int(adapt)}")
     
     #-------------------------------------------------
 
@@ -1822,7 +2566,7 @@ class BaspiLnhrdac2Controller():
         int: wave memory size (10 - 34000)
         """
 
-        return int(self.write("C SWG MS?"))
+        return int(self.__query_state("C SWG MS?"))
 
     #-------------------------------------------------
 
@@ -1835,7 +2579,7 @@ class BaspiLnhrdac2Controller():
         Returns:
         float: SWG frequency (0.001 Hz - 10 kHz)
         """
-        return float(self.write("C SWG NF?"))
+        return float(self.__query_state("C SWG NF?"))
 
     #-------------------------------------------------
 
@@ -1848,7 +2592,7 @@ class BaspiLnhrdac2Controller():
         string: waveform is clipping (True) or not clipping (False)
         """
 
-        return bool(int(self.write("C SWG CLP?")))
+        return self.write("C SWG CLP?") == "1"
     
     #-------------------------------------------------
 
@@ -1863,7 +2607,7 @@ class BaspiLnhrdac2Controller():
         int: clock period in us (micro seconds) (10 - 4000000000)
         """
 
-        return int(self.write("C SWG CP?"))
+        return int(self.__query_state("C SWG CP?"))
     
     #-------------------------------------------------
 
@@ -1949,7 +2693,7 @@ class BaspiLnhrdac2Controller():
             linearization (False)
         """
 
-        return bool(int(self.write("C SWG LIN?")))
+        return self.write("C SWG LIN?") == "1"
 
     #-------------------------------------------------
 
@@ -1978,7 +2722,10 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        return self.write("C SWG APPLY")
+        with self.__io_lock:
+            self.__clock_periods.clear()
+
+            return self.write("C SWG APPLY")
     
     #-------------------------------------------------
 
@@ -2001,7 +2748,7 @@ class BaspiLnhrdac2Controller():
         int: number of points saved in the memory (0 - 34000)
         """
 
-        return int(self.write(f"C WAV-{wav} MS?"))
+        return int(self.__query_state(f"C WAV-{wav} MS?"))
 
     #-------------------------------------------------
 
@@ -2051,9 +2798,26 @@ class BaspiLnhrdac2Controller():
             0 if no linearization will be applied
         """
 
-        return int(self.write(f"C WAV-{wav} LINCH?"))
+        return int(self.__query_state(f"C WAV-{wav} LINCH?"))
     
     #-------------------------------------------------
+
+    def get_wavs_linearization_channel(self, wavs: list[str]) -> list[int]:
+        """
+        Read which DAC channels are associated to multiple wave memories.
+        All queries are sent in a single transfer
+
+        Parameters:
+        wavs: wave memories ("A", "B", "C" or "D")
+
+        Returns:
+        list: associated channels for linearization (1 - 24), 
+            0 if no linearization will be applied, one per memory
+        """
+
+        return [int(answer) for answer in self.write_many([f"C WAV-{wav} LINCH?" for wav in wavs])]
+
+    #-------------------------------------------------
     
     def write_wav_to_awg(self, wav_awg: str) -> str:
         """
@@ -2067,10 +2831,47 @@ class BaspiLnhrdac2Controller():
         string: DAC-Error Code ("0" - "5"). "0" is always "no error"
         """
 
-        return self.write(f"C WAV-{wav_awg} WRITE")
+        with self.__io_lock:
+            self.__clock_periods.clear()
+
+            return self.write(f"C WAV-{wav_awg} WRITE")
     
     #-------------------------------------------------
 
+    def write_wavs_to_awg(self, wavs_awgs: list[str]) -> list[str]:
+        """
+        Write all contents of multiple wave memories to their associated 
+        AWG memories. The write commands are sent in a single transfer, 
+        afterwards the busy flags of all written memories are polled together 
+        until the device has finished writing
+
+        Parameters:
+        wavs_awgs: wave/ AWG memories ("A", "B", "C" or "D")
+
+        Returns:
+        list: DAC-Error Codes ("0" - "5"), one per memory. "0" is always "no error"
+
+        Raises:
+        KeyError: a memory couldn't be written by the device
+        """
+
+        commands = [f"C WAV-{wav_awg} WRITE" for wav_awg in wavs_awgs]
+
+        with self.__io_lock:
+            if self.__batch.commands:
+                self.__flush_batch()
+
+            self.__clock_periods.clear()
+            answers = self.__write_many(commands)
+            self.__wait_after_command(self.__ctrl_cmd_delay)
+            self.__busy_wavs.update(self.__written_wav(command) for command in commands)
+
+        self.wait_wavs_memory_ready(wavs_awgs)
+
+        return answers
+
+    #-------------------------------------------------
+
     def get_wav_memory_busy(self, wav: str) -> bool:
         """
         Read the state of the wave memory busy flag. If set, 
@@ -2083,17 +2884,58 @@ class BaspiLnhrdac2Controller():
         string: wave memonry busy (True) or not busy (False)
         """
 
-        return bool(int(self.write(f"C WAV-{wav} BUSY?")))
+        return self.write(f"C WAV-{wav} BUSY?") == "1"
 
+    #-------------------------------------------------
 
-# main -----------------------------------------------------------------
+    def get_wavs_memory_busy(self, wavs: list[str]) -> list[bool]:
+        """
+        Read the state of the busy flags of multiple wave memories.
+        All queries are sent in a single transfer
 
-if __name__ == "__main__":
+        Parameters: 
+        wavs: wave/ AWG memories ("A", "B", "C" or "D")
 
-    # small testing script
-    instrument = VisaInstrument('LNHRDAC', 'TCPIP0::192.168.0.5::23::SOCKET')
-    DAC = BaspiLnhrdac2Controller(instrument)
+        Returns:
+        list: wave memories busy (True) or not busy (False), one per memory
+        """
 
+        return [answer == "1" for answer in self.write_many([f"C WAV-{wav} BUSY?" for wav in wavs])]
 
+    #-------------------------------------------------
 
-    
+    def wait_wav_memory_ready(self, wav: str, initial_delay: float = 0.01, max_delay: float = 0.2) -> None:
+        """
+        Wait until the wave memory busy flag is cleared. The delay in between
+        two reads of the busy flag is doubled after every read, to not flood
+        the device with queries while it is writing its memory
+
+        Parameters:
+        wav: wave/ AWG memory ("A", "B", "C" or "D")
+        initial_delay: delay after the first read in s
+        max_delay: upper limit of the delay in between two reads in s
+        """
+
+        self.wait_wavs_memory_ready([wav], initial_delay, max_delay)
+
+    #-------------------------------------------------
+
+    def wait_wavs_memory_ready(self, wavs: list[str], initial_delay: float = 0.01, max_delay: float = 0.2, 
+                               timeout: Optional[float] = None) -> None:
+        """
+        Wait until the busy flags of multiple wave memories are cleared. 
+        The flags of all memories are read in a single transfer per poll and 
+        the delay in between two polls is doubled after every poll
+
+        Parameters:
+        wavs: wave/ AWG memories ("A", "B", "C" or "D")
+        initial_delay: delay after the first poll in s
+        max_delay: upper limit of the delay in between two polls in s
+        timeout: maximum time to wait in s, None to wait without limit
+
+        Raises:
+        TimeoutError: a memory is still busy after the timeout
+        """
+
+        if not self.__wait_until(lambda: not any(self.get_wavs_memory_busy(wavs)), timeout, initial_delay, max_delay):
+            raise TimeoutError(f"Wave memories {', '.join(wavs)} still busy after {timeout} s.")